@@ -6,11 +6,17 @@ BLEURT checkpoints are large (~400MB-1GB) and hosted on Google Cloud Storage.
 This script helps download and set up the checkpoint for use.
 """
 
+import io
 import os
 import sys
+import math
+import shutil
+import threading
+import urllib.error
 import urllib.request
 import zipfile
 import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 CHECKPOINTS = {
@@ -31,8 +37,279 @@ CHECKPOINTS = {
     }
 }
 
-def download_checkpoint(checkpoint_name='BLEURT-20-D3', dest_dir='bleurt_checkpoints'):
-    """Download a BLEURT checkpoint from Google Cloud Storage."""
+def _progress_hook(count, block_size, total_size):
+    """Print download progress for urlretrieve."""
+    percent = int(count * block_size * 100 / total_size)
+    sys.stdout.write(f"\rDownloading... {percent}%")
+    sys.stdout.flush()
+
+class RangeRequestError(Exception):
+    """
+    Raised when a server does not honour an HTTP byte-range request.
+
+    Not an OSError, so zipfile does not mask it as a BadZipFile.
+    """
+
+def _range_length(url):
+    """Return the content length if the server supports byte ranges, else None."""
+    head = urllib.request.Request(url, method='HEAD')
+    try:
+        with urllib.request.urlopen(head) as response:
+            length = int(response.headers.get('Content-Length', 0))
+            accept_ranges = response.headers.get('Accept-Ranges', '')
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"Could not check range support ({e}), using a single-stream download")
+        return None
+
+    if length <= 0 or accept_ranges.lower() != 'bytes':
+        return None
+    return length
+
+def download_ranges(url, dest, concurrency=8, chunk_mb=32):
+    """
+    Download a file using parallel HTTP range requests.
+
+    Falls back to a single-stream download when the server does not
+    advertise byte-range support.
+    """
+    dest = Path(dest)
+    tmp_path = dest.with_name(dest.name + '.part')
+
+    length = _range_length(url)
+
+    if length is None:
+        _download_single(url, tmp_path, dest)
+        return
+
+    chunk_size = chunk_mb * 1024 * 1024
+    ranges = [
+        (start, min(start + chunk_size, length))
+        for start in range(0, length, chunk_size)
+    ]
+
+    # Pre-size the destination so each worker can write at its own offset
+    with open(tmp_path, 'wb') as f:
+        f.truncate(length)
+
+    lock = threading.Lock()
+    downloaded = [0]
+
+    def fetch(byte_range):
+        start, end = byte_range
+        request = urllib.request.Request(url, headers={'Range': f'bytes={start}-{end - 1}'})
+        with urllib.request.urlopen(request) as response:
+            # A 200 carries the whole body, which would overrun this range
+            if response.status != 206:
+                raise RangeRequestError(
+                    f"expected 206 Partial Content for bytes {start}-{end - 1}, got {response.status}"
+                )
+            remaining = end - start
+            with open(tmp_path, 'r+b') as f:
+                f.seek(start)
+                while remaining:
+                    block = response.read(min(1 << 20, remaining))
+                    if not block:
+                        break
+                    f.write(block)
+                    remaining -= len(block)
+                    with lock:
+                        downloaded[0] += len(block)
+                        percent = int(downloaded[0] * 100 / length)
+                        sys.stdout.write(f"\rDownloading... {percent}%")
+                        sys.stdout.flush()
+        if remaining:
+            raise RangeRequestError(
+                f"short read for bytes {start}-{end - 1}: got {end - start - remaining} of {end - start}"
+            )
+
+    workers = min(concurrency, math.ceil(length / chunk_size))
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        list(pool.map(fetch, ranges))
+    except RangeRequestError as e:
+        pool.shutdown(cancel_futures=True)
+        print(f"\nRanged download failed ({e}), retrying as a single stream...")
+        _download_single(url, tmp_path, dest)
+        return
+    except BaseException:
+        pool.shutdown(cancel_futures=True)
+        tmp_path.unlink(missing_ok=True)
+        raise
+    pool.shutdown()
+
+    os.replace(tmp_path, dest)
+
+def _download_single(url, tmp_path, dest):
+    """Download url in one stream via tmp_path, removing tmp_path on failure."""
+    try:
+        urllib.request.urlretrieve(url, tmp_path, _progress_hook)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, dest)
+
+BUFFER_SIZE = 1 << 20
+EXTRACT_WORKERS = 4
+SMALL_MEMBER_SIZE = 4 * 1024
+STREAM_BLOCK_SIZE = 8 * 1024 * 1024
+
+def _member_path(dest_path, info):
+    """Resolve an archive member's output path, rejecting paths outside dest_path."""
+    root = Path(dest_path).resolve()
+    target = (root / info.filename).resolve()
+    if root != target and root not in target.parents:
+        raise ValueError(f"Unsafe path in archive: {info.filename}")
+    return target
+
+def _copy_member(zf, info, target):
+    """Copy one archive member to target using buffered I/O."""
+    with zf.open(info) as src, open(target, 'wb', buffering=BUFFER_SIZE) as dst:
+        shutil.copyfileobj(src, dst, length=BUFFER_SIZE)
+
+def extract_zip(zip_path, dest_path, workers=EXTRACT_WORKERS):
+    """
+    Extract a zip archive member by member using 1 MiB buffered I/O.
+
+    Members of at least SMALL_MEMBER_SIZE bytes are extracted by a thread
+    pool, each thread reading through its own ZipFile handle. Set
+    workers=1 to extract serially (e.g. on spinning disks).
+    """
+    parallel = []
+
+    with open(zip_path, 'rb', buffering=BUFFER_SIZE) as raw, zipfile.ZipFile(raw) as zf:
+        # Create all output directories up front
+        members = []
+        for info in zf.infolist():
+            target = _member_path(dest_path, info)
+            if info.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                members.append((info, target))
+
+        # Small members are cheaper to extract here than to dispatch
+        for info, target in members:
+            if workers > 1 and info.file_size >= SMALL_MEMBER_SIZE:
+                parallel.append((info, target))
+            else:
+                _copy_member(zf, info, target)
+
+    if not parallel:
+        return
+
+    local = threading.local()
+    handles = []
+
+    def extract_one(member):
+        zf = getattr(local, 'zf', None)
+        if zf is None:
+            raw = open(zip_path, 'rb', buffering=BUFFER_SIZE)
+            zf = local.zf = zipfile.ZipFile(raw)
+            handles.append((zf, raw))
+        _copy_member(zf, *member)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(extract_one, parallel))
+    finally:
+        for zf, raw in handles:
+            zf.close()
+            raw.close()
+
+class RangedHTTPFile(io.RawIOBase):
+    """Read-only seekable file backed by HTTP byte-range requests."""
+
+    def __init__(self, url, length, block_size=STREAM_BLOCK_SIZE):
+        self.url = url
+        self.length = length
+        self.block_size = block_size
+        self._pos = 0
+        self._buf = b''
+        self._buf_start = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.length + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._pos = max(0, pos)
+        return self._pos
+
+    def readinto(self, b):
+        n = min(len(b), self.length - self._pos)
+        if n <= 0:
+            return 0
+
+        # Serve from the read-ahead block, fetching a new one on a miss
+        start = self._pos - self._buf_start
+        if start < 0 or start + n > len(self._buf):
+            end = min(self._pos + max(n, self.block_size), self.length)
+            request = urllib.request.Request(
+                self.url, headers={'Range': f'bytes={self._pos}-{end - 1}'}
+            )
+            with urllib.request.urlopen(request) as response:
+                # Never read a 200 body: it is the whole archive
+                if response.status != 206:
+                    raise RangeRequestError(
+                        f"expected 206 Partial Content for bytes {self._pos}-{end - 1}, "
+                        f"got {response.status}"
+                    )
+                buf = response.read(end - self._pos)
+            if len(buf) != end - self._pos:
+                raise RangeRequestError(
+                    f"short read for bytes {self._pos}-{end - 1}: "
+                    f"got {len(buf)} of {end - self._pos}"
+                )
+            self._buf = buf
+            self._buf_start = self._pos
+            start = 0
+
+        b[:n] = self._buf[start:start + n]
+        self._pos += n
+        return n
+
+def stream_extract(url, dest_path):
+    """
+    Extract a remote zip archive without downloading it to disk first.
+
+    Only the central directory and member data are fetched, via ranged
+    GETs. Returns False if the server does not support byte ranges.
+    """
+    length = _range_length(url)
+    if length is None:
+        return False
+
+    with RangedHTTPFile(url, length) as remote, zipfile.ZipFile(remote) as zf:
+        for info in zf.infolist():
+            target = _member_path(dest_path, info)
+            if info.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _copy_member(zf, info, target)
+
+    return True
+
+def download_checkpoint(checkpoint_name='BLEURT-20-D3', dest_dir='bleurt_checkpoints', stream=False):
+    """
+    Download a BLEURT checkpoint from Google Cloud Storage.
+
+    With stream=True the archive is extracted directly from the server,
+    roughly halving peak disk usage.
+    """
 
     if checkpoint_name not in CHECKPOINTS:
         print(f"Error: Unknown checkpoint '{checkpoint_name}'")
@@ -66,23 +343,27 @@ def download_checkpoint(checkpoint_name='BLEURT-20-D3', dest_dir='bleurt_checkpo
     zip_path = dest_path / f"{checkpoint_name}.zip"
 
     try:
-        def progress_hook(count, block_size, total_size):
-            percent = int(count * block_size * 100 / total_size)
-            sys.stdout.write(f"\rDownloading... {percent}%")
-            sys.stdout.flush()
-
-        urllib.request.urlretrieve(url, zip_path, progress_hook)
+        if stream:
+            print("Streaming and extracting checkpoint...")
+            try:
+                if stream_extract(url, dest_path):
+                    print(f"✓ Checkpoint extracted to {checkpoint_dir}")
+                    return True
+                print("Server does not support range requests, downloading archive instead...")
+            except RangeRequestError as e:
+                print(f"Streaming failed ({e}), downloading archive instead...")
+
+        download_ranges(url, zip_path)
         print("\n✓ Download complete!")
 
         # Extract the zip file
         print(f"Extracting checkpoint...")
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(dest_path)
+        extract_zip(zip_path, dest_path)
 
         print(f"✓ Checkpoint extracted to {checkpoint_dir}")
 
         # Clean up zip file
-        zip_path.unlink()
+        os.unlink(zip_path)
         print(f"✓ Cleaned up temporary files")
 
         return True
@@ -135,8 +416,12 @@ def main():
     # Default to smallest checkpoint for demos
     checkpoint_name = 'BLEURT-20-D3'
 
-    if len(sys.argv) > 1:
-        checkpoint_name = sys.argv[1]
+    # --stream extracts straight from the server (less disk)
+    args = [a for a in sys.argv[1:] if a != '--stream']
+    stream = len(args) != len(sys.argv) - 1
+
+    if args:
+        checkpoint_name = args[0]
 
     print("Available checkpoints:")
     for name, info in CHECKPOINTS.items():
@@ -147,7 +432,7 @@ def main():
     print()
 
     # Download checkpoint
-    success = download_checkpoint(checkpoint_name)
+    success = download_checkpoint(checkpoint_name, stream=stream)
 
     if not success:
         print("\n✗ Failed to download checkpoint")
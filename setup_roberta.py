@@ -7,17 +7,29 @@ evaluation, avoiding repeated downloads during evaluation runs.
 Files downloaded:
 - config.json (model configuration)
 - merges.txt (BPE merges for tokenizer)
-- pytorch_model.bin (model weights)
+- model.safetensors (model weights; pytorch_model.bin if unavailable)
 - vocab.json (tokenizer vocabulary)
+- tokenizer.json (fast tokenizer)
+
+Files are fetched concurrently with snapshot_download. If the optional
+hf_transfer package is installed (pip install hf_transfer), large files
+are also downloaded with parallel byte-range requests.
 
 Usage:
     python setup_roberta.py
 """
 
+import importlib.util
 import os
 import sys
 from pathlib import Path
-from huggingface_hub import hf_hub_download
+
+# Use the Rust hf_transfer backend when available (read by huggingface_hub
+# at import time, so this must be set before importing it)
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+from huggingface_hub import snapshot_download
 
 
 def download_roberta_large():
@@ -40,8 +52,9 @@ def download_roberta_large():
     files_to_download = [
         "config.json",
         "merges.txt",
-        "pytorch_model.bin",
-        "vocab.json"
+        "model.safetensors",
+        "vocab.json",
+        "tokenizer.json"
     ]
 
     print("Files to download:")
@@ -49,25 +62,35 @@ def download_roberta_large():
         print(f"  - {f}")
     print()
 
-    # Download each file
-    for filename in files_to_download:
-        print(f"Downloading {filename}...", end=" ", flush=True)
+    # Download all files concurrently
+    print("Downloading files...", end=" ", flush=True)
 
-        try:
-            # Download from Hugging Face Hub
-            downloaded_path = hf_hub_download(
+    try:
+        snapshot_download(
+            repo_id=model_name,
+            allow_patterns=files_to_download,
+            local_dir=local_dir,
+            local_dir_use_symlinks=False,
+            max_workers=8
+        )
+        print("✓")
+
+        # Fall back to pickle weights if the repo has no safetensors file
+        if not (local_dir / "model.safetensors").exists():
+            print("model.safetensors not available, downloading pytorch_model.bin...", end=" ", flush=True)
+            files_to_download[files_to_download.index("model.safetensors")] = "pytorch_model.bin"
+            snapshot_download(
                 repo_id=model_name,
-                filename=filename,
-                cache_dir=None,
+                allow_patterns=["pytorch_model.bin"],
                 local_dir=local_dir,
                 local_dir_use_symlinks=False
             )
             print("✓")
 
-        except Exception as e:
-            print(f"✗")
-            print(f"Error downloading {filename}: {e}")
-            return False
+    except Exception as e:
+        print(f"✗")
+        print(f"Error downloading files: {e}")
+        return False
 
     print()
     print("="*80)
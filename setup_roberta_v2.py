@@ -45,10 +45,18 @@ def download_roberta_large():
 
         # Download and cache model
         print("2. Downloading model weights...")
-        model = AutoModel.from_pretrained(
-            "roberta-large",
-            cache_dir=str(cache_dir)
-        )
+        try:
+            model = AutoModel.from_pretrained(
+                "roberta-large",
+                cache_dir=str(cache_dir),
+                use_safetensors=True
+            )
+        except OSError:
+            # No safetensors weights published; fall back to pytorch_model.bin
+            model = AutoModel.from_pretrained(
+                "roberta-large",
+                cache_dir=str(cache_dir)
+            )
         print("   ✓ Model downloaded")
 
         print()
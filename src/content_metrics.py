@@ -2,15 +2,93 @@
 Content quality metrics: ROUGE, BERTScore, and BLEURT.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from pathlib import Path
-from rouge_score import rouge_scorer
+import contextlib
+import functools
+import hashlib
+import os
+import re
+import threading
+from rouge_score import rouge_scorer, tokenizers
+from tqdm import tqdm
 from src.text_utils import count_tokens
 
 
+# BERTScore models shared by all calculators in the process, keyed by
+# (model name, compile flag, quantize flag)
+_MODEL_CACHE: Dict[Any, tuple] = {}
+_MODEL_LOCK = threading.Lock()
+
+# BLEURT batches scored per scorer call (one progress bar update each)
+BLEURT_BATCHES_PER_STEP = 16
+
+
+class _CachingRougeTokenizer(tokenizers.Tokenizer):
+    """ROUGE tokenizer that memoizes stems and tokenized texts."""
+
+    def __init__(self, use_stemmer: bool = True, max_cache_size: int = 100_000):
+        """
+        Initialize caching tokenizer.
+
+        Args:
+            use_stemmer: Whether to apply the Porter stemmer (as rouge_score does)
+            max_cache_size: Max number of tokenized texts kept in memory
+        """
+        self._tokenizer = tokenizers.DefaultTokenizer(use_stemmer=use_stemmer)
+        self._max_cache_size = max_cache_size
+        self._cache = {}
+
+        # Memoize per-word stemming; the same words recur across summaries
+        stemmer = getattr(self._tokenizer, '_stemmer', None)
+        if stemmer is not None:
+            stemmer.stem = functools.lru_cache(maxsize=200_000)(stemmer.stem)
+
+    def tokenize(self, text):
+        tokens = self._cache.get(text)
+        if tokens is None:
+            tokens = self._tokenizer.tokenize(text)
+            if len(self._cache) >= self._max_cache_size:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[text] = tokens
+        return tokens
+
+
+def _bertscore_f1(hyp, ref, hyp_mask, ref_mask):
+    """
+    Greedy-matching BERTScore F1 over a padded batch.
+
+    Args:
+        hyp: Normalized hypothesis embeddings [B, hyp_len, hidden_dim]
+        ref: Normalized reference embeddings [B, ref_len, hidden_dim]
+        hyp_mask: Boolean mask of real hypothesis tokens [B, hyp_len]
+        ref_mask: Boolean mask of real reference tokens [B, ref_len]
+
+    Returns:
+        F1 tensor [B]
+    """
+    # Cosine similarity matrices
+    sim = hyp @ ref.transpose(-1, -2)  # [B, hyp_len, ref_len]
+
+    # Precision: for each hypothesis token, max similarity with reference
+    hyp_best = sim.masked_fill(~ref_mask[:, None, :], -1.0).max(dim=2)[0]
+    precision = (hyp_best * hyp_mask).sum(dim=1) / hyp_mask.sum(dim=1).clamp_min(1)
+
+    # Recall: for each reference token, max similarity with hypothesis
+    ref_best = sim.masked_fill(~hyp_mask[:, :, None], -1.0).max(dim=1)[0]
+    recall = (ref_best * ref_mask).sum(dim=1) / ref_mask.sum(dim=1).clamp_min(1)
+
+    # F1 (0 where precision + recall is not positive)
+    total = precision + recall
+    return (2 * precision * recall / total).masked_fill(total <= 0, 0.0)
+
+
 class ContentMetricsCalculator:
     """Calculate content quality metrics for summaries."""
 
+    # Composite content_quality weights (renormalized over enabled metrics)
+    CONTENT_QUALITY_WEIGHTS = {'rouge': 0.4, 'bertscore': 0.3, 'bleurt': 0.3}
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize metrics calculator.
@@ -21,10 +99,32 @@ class ContentMetricsCalculator:
         self.config = config
         self.content_config = config.get('content', {})
 
+        # Resolve enabled metrics once
+        self._use_rouge = self.content_config.get('use_rouge', True)
+        self._use_bertscore = self.content_config.get('use_bertscore', True)
+        self._use_bleurt = self.content_config.get('use_bleurt', True)
+
+        enabled = {
+            'rouge': self._use_rouge,
+            'bertscore': self._use_bertscore,
+            'bleurt': self._use_bleurt,
+        }
+        weights = {k: w for k, w in self.CONTENT_QUALITY_WEIGHTS.items() if enabled[k]}
+        total = sum(weights.values())
+        # With no metric enabled there are no weights and content_quality is NaN
+        self._content_quality_weights = (
+            {k: w / total for k, w in weights.items()} if total > 0 else {}
+        )
+
         # Initialize ROUGE
-        if self.content_config.get('use_rouge', True):
+        if self._use_rouge:
             rouge_types = ['rouge1', 'rouge2', 'rougeLsum']
-            self.rouge_scorer = rouge_scorer.RougeScorer(rouge_types, use_stemmer=True)
+            # Tokenized/stemmed texts are cached, so references scored against
+            # several hypotheses are only tokenized once
+            self.rouge_scorer = rouge_scorer.RougeScorer(
+                rouge_types,
+                tokenizer=_CachingRougeTokenizer(use_stemmer=True)
+            )
         else:
             self.rouge_scorer = None
 
@@ -32,21 +132,63 @@ class ContentMetricsCalculator:
         self.bertscore_model = self.content_config.get('bertscore_model', 'roberta-large')
         self._bertscore_model = None  # Lazy load
         self._bertscore_tokenizer = None  # Lazy load
+        self._bertscore_device = None  # Set on model load
+        self._bertscore_dtype = None  # Set on model load
+        # Compile the model with torch.compile (pays off on large corpora)
+        self.bertscore_compile = self.content_config.get('bertscore_compile', False)
+        self._bertscore_f1_fn = None  # Set on first use
+        # Int8 dynamic quantization of Linear layers when running on CPU
+        self.bertscore_quantize = self.content_config.get('bertscore_quantize', False)
+
+        # Reference embeddings are reused when a gold summary is scored
+        # against several hypotheses
+        self.bertscore_cache_size = self.content_config.get('bertscore_cache_size', 1024)
+        self._ref_embed_cache = {}
+
+        # Optional on-disk embedding cache shared across runs
+        self.bertscore_cache_dir = self.content_config.get('bertscore_cache_dir')
+
+        # BERTScore backend: 'manual' (transformers) or 'bert_score' (library)
+        self.bertscore_backend = self.content_config.get('bertscore_backend', 'manual')
+        self._bert_scorer = None  # Lazy load
 
         # BLEURT checkpoint
         self.bleurt_checkpoint = self.content_config.get('bleurt_checkpoint', 'BLEURT-20-D12')
         self.bleurt_scorer = None  # Lazy load
 
+        # Batch size for batched metric inference
+        self.batch_size = self.content_config.get('batch_size', 64)
+
+        # Show tqdm progress bars for the BERTScore/BLEURT batches
+        self.show_progress = self.content_config.get('show_progress', False)
+
     def _init_bleurt(self):
         """Lazy initialization of BLEURT scorer."""
-        if self.bleurt_scorer is None and self.content_config.get('use_bleurt', True):
+        if self.bleurt_scorer is None and self._use_bleurt:
             try:
                 from bleurt import score
-                self.bleurt_scorer = score.BleurtScorer(self.bleurt_checkpoint)
+                # Length-batching groups inputs by length to reduce padding
+                scorer_cls = getattr(score, 'LengthBatchingBleurtScorer', score.BleurtScorer)
+                self.bleurt_scorer = scorer_cls(self.bleurt_checkpoint)
             except Exception as e:
                 print(f"Warning: BLEURT initialization failed: {e}")
                 self.bleurt_scorer = False
 
+    def _get_bert_scorer(self):
+        """Lazy initialization of a persistent bert_score.BERTScorer."""
+        if self._bert_scorer is None:
+            try:
+                from bert_score import BERTScorer
+                self._bert_scorer = BERTScorer(
+                    model_type=self.bertscore_model,
+                    lang='en',
+                    rescale_with_baseline=True
+                )
+            except Exception as e:
+                print(f"Warning: BERTScorer initialization failed: {e}")
+                self._bert_scorer = False
+        return self._bert_scorer
+
     def calculate_rouge(
         self,
         reference: str,
@@ -77,33 +219,28 @@ class ContentMetricsCalculator:
         }
 
     def _load_bertscore_model(self):
-        """Lazy load BERTScore model and tokenizer from local directory."""
+        """
+        Lazy load BERTScore model and tokenizer from local directory.
+
+        Loaded models are shared by all calculators in the process; the
+        load itself is guarded by a lock so concurrent callers load once.
+        """
+        if self._bertscore_model is False:
+            return None, None
         if self._bertscore_model is not None:
             return self._bertscore_model, self._bertscore_tokenizer
 
         try:
-            from transformers import AutoModel, AutoTokenizer
-
-            # Try to load from local directory first (using configured model name)
-            model_dir = Path(self.bertscore_model)
-
-            if model_dir.exists() and (model_dir / "config.json").exists():
-                print(f"Loading BERTScore model from local directory: {model_dir}")
-                self._bertscore_tokenizer = AutoTokenizer.from_pretrained(
-                    str(model_dir),
-                    local_files_only=True
-                )
-                self._bertscore_model = AutoModel.from_pretrained(
-                    str(model_dir),
-                    local_files_only=True
-                )
-            else:
-                print(f"Loading BERTScore model from HuggingFace: {self.bertscore_model}")
-                self._bertscore_tokenizer = AutoTokenizer.from_pretrained(self.bertscore_model)
-                self._bertscore_model = AutoModel.from_pretrained(self.bertscore_model)
-
-            # Move to eval mode
-            self._bertscore_model.eval()
+            key = (self.bertscore_model, self.bertscore_compile, self.bertscore_quantize)
+            with _MODEL_LOCK:
+                if key not in _MODEL_CACHE:
+                    _MODEL_CACHE[key] = self._build_bertscore_model()
+                (
+                    self._bertscore_model,
+                    self._bertscore_tokenizer,
+                    self._bertscore_device,
+                    self._bertscore_dtype,
+                ) = _MODEL_CACHE[key]
 
             return self._bertscore_model, self._bertscore_tokenizer
 
@@ -113,19 +250,79 @@ class ContentMetricsCalculator:
             self._bertscore_tokenizer = False
             return None, None
 
+    def _build_bertscore_model(self):
+        """
+        Load the BERTScore model and tokenizer onto the best available device.
+
+        Returns:
+            Tuple of (model, tokenizer, device, dtype)
+        """
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        # Use GPU in half precision when available, FP32 on CPU
+        if torch.cuda.is_available():
+            device = torch.device("cuda")
+            dtype = torch.float16
+        else:
+            device = torch.device("cpu")
+            dtype = torch.float32
+
+        # Try to load from local directory first (using configured model name)
+        model_dir = Path(self.bertscore_model)
+
+        if model_dir.exists() and (model_dir / "config.json").exists():
+            print(f"Loading BERTScore model from local directory: {model_dir}")
+            source = str(model_dir)
+            load_kwargs = {'local_files_only': True}
+        else:
+            print(f"Loading BERTScore model from HuggingFace: {self.bertscore_model}")
+            source = self.bertscore_model
+            load_kwargs = {}
+
+        tokenizer = AutoTokenizer.from_pretrained(source, **load_kwargs)
+
+        # Prefer safetensors (mmap load); fall back to pytorch_model.bin
+        try:
+            model = AutoModel.from_pretrained(
+                source,
+                torch_dtype=dtype,
+                use_safetensors=True,
+                **load_kwargs
+            )
+        except OSError:
+            model = AutoModel.from_pretrained(
+                source,
+                torch_dtype=dtype,
+                **load_kwargs
+            )
+
+        # Move to device and eval mode
+        model = model.to(device)
+        model.eval()
+
+        if self.bertscore_quantize and device.type == "cpu":
+            # Int8 weights for Linear layers; activations stay FP32
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        if self.bertscore_compile and hasattr(torch, 'compile'):
+            # Compiled calls run under _compile_guard (eager fallback);
+            # dynamic=True avoids recompiling for every padded length
+            model = torch.compile(model, mode="reduce-overhead", dynamic=True)
+
+        return model, tokenizer, device, dtype
+
     def calculate_bertscore(
         self,
         reference: str,
         hypothesis: str
     ) -> Optional[float]:
         """
-        Calculate BERTScore manually using transformers.
+        Calculate BERTScore for a single pair.
 
-        Computes BERTScore by:
-        1. Loading model from local roberta-large/ directory if available
-        2. Computing embeddings for reference and hypothesis
-        3. Computing greedy token-level matching with cosine similarity
-        4. Returning F1 score
+        Thin wrapper around calculate_bertscore_batch.
 
         Args:
             reference: Gold summary
@@ -134,62 +331,314 @@ class ContentMetricsCalculator:
         Returns:
             BERTScore F1 or None if disabled
         """
-        if not self.content_config.get('use_bertscore', True):
-            return None
+        return self.calculate_bertscore_batch([reference], [hypothesis])[0]
 
-        try:
-            import torch
-            import torch.nn.functional as F
+    def calculate_bertscore_batch(
+        self,
+        references: List[str],
+        hypotheses: List[str]
+    ) -> List[Optional[float]]:
+        """
+        Calculate BERTScore manually using transformers for a batch of pairs.
+
+        Computes BERTScore by:
+        1. Loading model from local roberta-large/ directory if available
+        2. Computing padded embeddings for all references and hypotheses
+           in one forward pass each (reference embeddings are cached)
+        3. Computing greedy token-level matching with cosine similarity,
+           ignoring padding and CLS/SEP tokens
+        4. Returning F1 score per pair
 
+        Args:
+            references: Gold summaries
+            hypotheses: Generated summaries (same length as references)
+
+        Returns:
+            List of BERTScore F1 values (None entries if disabled/failed)
+        """
+        if not self._use_bertscore or not references:
+            return [None] * len(references)
+
+        if self.bertscore_backend == 'bert_score':
+            return self._calculate_bertscore_library(references, hypotheses)
+
+        try:
             # Load model and tokenizer
             model, tokenizer = self._load_bertscore_model()
 
             if model is None or tokenizer is None:
-                return None
+                return [None] * len(references)
+
+            # Embed references (cached across calls) and hypotheses
+            ref_embeds = self._embed_batch(
+                references, cache=self._ref_embed_cache, desc='  BERTScore (references)'
+            )
+            hyp_embeds = self._embed_batch(hypotheses, desc='  BERTScore (summaries)')
+
+            return self._greedy_match_f1(hyp_embeds, ref_embeds)
+
+        except Exception as e:
+            print(f"Warning: BERTScore calculation failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return [None] * len(references)
+
+    def _embed_batch(
+        self,
+        texts: List[str],
+        cache: Optional[Dict[str, Any]] = None,
+        desc: str = '  BERTScore'
+    ) -> List[Any]:
+        """
+        Compute normalized token embeddings for a list of texts.
+
+        Texts are looked up in the in-memory cache, then in the on-disk
+        cache (if bertscore_cache_dir is set). Remaining unique texts are
+        tokenized once, sorted by length and run through the model in
+        micro-batches of batch_size. CLS/SEP and padding are dropped, so
+        each entry is a [num_tokens, hidden_dim] tensor.
+
+        Args:
+            texts: Texts to embed
+            cache: Optional dict of text -> embeddings, read and updated in place
+            desc: Progress bar label (shown when show_progress is set)
+
+        Returns:
+            List of embedding tensors, aligned with texts
+        """
+        tokenizer = self._bertscore_tokenizer
+        embeds = {}
+
+        if cache is not None:
+            for text in texts:
+                if text in cache:
+                    embeds[text] = cache[text]
+
+        # Unique texts still needing a forward pass
+        missing = [t for t in dict.fromkeys(texts) if t not in embeds]
+
+        if missing and self.bertscore_cache_dir:
+            for text in missing:
+                emb = self._load_cached_embedding(text)
+                if emb is not None:
+                    embeds[text] = emb
+                    self._cache_put(cache, text, emb)
+            missing = [t for t in missing if t not in embeds]
+
+        if missing:
+            # Tokenize once without padding to get lengths
+            encoded = tokenizer(missing, truncation=True, max_length=512)
+            input_ids = encoded['input_ids']
+
+            # Length-sorted micro-batches keep padding to a minimum
+            order = sorted(range(len(missing)), key=lambda i: len(input_ids[i]))
+
+            progress = tqdm(
+                total=len(missing), desc=desc, unit='text', disable=not self.show_progress
+            )
+            for start in range(0, len(order), self.batch_size):
+                chunk = order[start:start + self.batch_size]
+                for text, emb in zip(
+                    [missing[i] for i in chunk],
+                    self._embed_tokenized([input_ids[i] for i in chunk])
+                ):
+                    embeds[text] = emb
+                    self._cache_put(cache, text, emb)
+                    if self.bertscore_cache_dir:
+                        self._save_cached_embedding(text, emb)
+                progress.update(len(chunk))
+            progress.close()
+
+        return [embeds[t] for t in texts]
+
+    def _cache_put(self, cache: Optional[Dict[str, Any]], text: str, emb: Any):
+        """Store an embedding in a bounded in-memory cache, dropping the oldest entry when full."""
+        # A size of 0 (or less) disables the in-memory cache
+        if cache is None or self.bertscore_cache_size <= 0:
+            return
+        if len(cache) >= self.bertscore_cache_size:
+            cache.pop(next(iter(cache)))
+        cache[text] = emb
+
+    def _embedding_cache_path(self, text: str) -> Path:
+        """
+        Path of the on-disk cache file for a text.
+
+        Files are keyed by a content hash and grouped per model, dtype and
+        quantization setting, so switching encoders or precision (e.g.
+        FP16 on GPU vs FP32 on CPU) never reuses stale embeddings.
+        """
+        model_key = re.sub(r'[^A-Za-z0-9_.-]+', '_', self.bertscore_model).strip('_')
+        model_key += '-' + str(self._bertscore_dtype).replace('torch.', '')
+        if self.bertscore_quantize:
+            model_key += '-int8'
+        key = hashlib.blake2b(text.encode('utf-8')).hexdigest()[:32]
+        return Path(self.bertscore_cache_dir) / model_key / f"{key}.npy"
+
+    def _compile_guard(self):
+        """
+        Context for calls into torch.compile'd code.
+
+        Compilation happens lazily on a call (and again for new shapes), so
+        unsupported kernels fall back to eager execution for the duration
+        of the call only; the process-wide dynamo setting is left alone.
+        """
+        import torch
+
+        if not (self.bertscore_compile and hasattr(torch, 'compile')):
+            return contextlib.nullcontext()
 
-            # Tokenize
-            ref_tokens = tokenizer(reference, return_tensors="pt", padding=True, truncation=True, max_length=512)
-            hyp_tokens = tokenizer(hypothesis, return_tensors="pt", padding=True, truncation=True, max_length=512)
+        import torch._dynamo
+        return torch._dynamo.config.patch(suppress_errors=True)
 
-            # Get embeddings
-            with torch.no_grad():
-                ref_outputs = model(**ref_tokens)
-                hyp_outputs = model(**hyp_tokens)
+    def _load_cached_embedding(self, text: str):
+        """Load a cached embedding tensor for text, or None on a miss."""
+        import numpy as np
+        import torch
 
-            # Get last hidden states
-            ref_embeds = ref_outputs.last_hidden_state[0]  # [seq_len, hidden_dim]
-            hyp_embeds = hyp_outputs.last_hidden_state[0]
+        path = self._embedding_cache_path(text)
+        if not path.exists():
+            return None
 
-            # Remove CLS and SEP tokens (first and last)
-            ref_embeds = ref_embeds[1:-1]
-            hyp_embeds = hyp_embeds[1:-1]
+        try:
+            array = np.load(path)
+        except (OSError, ValueError):
+            return None
 
-            # Normalize embeddings
-            ref_embeds = F.normalize(ref_embeds, p=2, dim=1)
-            hyp_embeds = F.normalize(hyp_embeds, p=2, dim=1)
+        return torch.from_numpy(array).to(self._bertscore_device, dtype=self._bertscore_dtype)
 
-            # Compute cosine similarity matrix
-            sim_matrix = torch.mm(hyp_embeds, ref_embeds.t())  # [hyp_len, ref_len]
+    def _save_cached_embedding(self, text: str, emb: Any):
+        """Write an embedding tensor to the on-disk cache (atomically)."""
+        import numpy as np
 
-            # Precision: for each hypothesis token, find max similarity with reference
-            precision = sim_matrix.max(dim=1)[0].mean().item()
+        path = self._embedding_cache_path(text)
+        path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Recall: for each reference token, find max similarity with hypothesis
-            recall = sim_matrix.max(dim=0)[0].mean().item()
+        tmp_path = path.with_name(path.stem + '.tmp.npy')
+        np.save(tmp_path, emb.cpu().numpy())
+        os.replace(tmp_path, path)
 
-            # F1
-            if precision + recall > 0:
-                f1 = 2 * (precision * recall) / (precision + recall)
-            else:
-                f1 = 0.0
+    def _embed_tokenized(self, input_ids: List[List[int]]) -> List[Any]:
+        """
+        Run one padded forward pass over pre-tokenized inputs.
+
+        Args:
+            input_ids: Token ids per text (with special tokens)
+
+        Returns:
+            List of normalized [num_tokens, hidden_dim] tensors without
+            CLS/SEP and padding
+        """
+        import torch
+        import torch.nn.functional as F
+
+        model, tokenizer = self._bertscore_model, self._bertscore_tokenizer
 
-            return f1
+        # Pad to longest in micro-batch and move to model device
+        device = self._bertscore_device
+        tokens = tokenizer.pad({'input_ids': input_ids}, padding=True, return_tensors="pt")
+        tokens = {k: v.to(device, non_blocking=True) for k, v in tokens.items()}
+
+        # Get embeddings (autocast only applies on GPU)
+        with self._compile_guard(), torch.inference_mode(), torch.autocast(
+            device_type=device.type,
+            dtype=self._bertscore_dtype,
+            enabled=device.type == "cuda"
+        ):
+            hidden = model(**tokens).last_hidden_state  # [B, seq_len, hidden_dim]
+
+        hidden = F.normalize(hidden, p=2, dim=-1)
+
+        # Mask over real tokens, excluding CLS and SEP
+        mask = self._content_token_mask(tokens['attention_mask'])
+
+        return [hidden[i][mask[i]] for i in range(hidden.size(0))]
+
+    def _greedy_match_f1(self, hyp_embeds: List[Any], ref_embeds: List[Any]) -> List[float]:
+        """
+        Greedy cosine matching between padded hypothesis/reference embeddings.
+
+        Args:
+            hyp_embeds: Normalized hypothesis embeddings, one tensor per pair
+            ref_embeds: Normalized reference embeddings, one tensor per pair
+
+        Returns:
+            List of BERTScore F1 values
+        """
+        import torch
+        from torch.nn.utils.rnn import pad_sequence
+
+        hyp = pad_sequence(hyp_embeds, batch_first=True)  # [B, hyp_len, hidden_dim]
+        ref = pad_sequence(ref_embeds, batch_first=True)  # [B, ref_len, hidden_dim]
+
+        # Masks over non-padded positions
+        hyp_lengths = torch.tensor([e.size(0) for e in hyp_embeds], device=hyp.device)
+        ref_lengths = torch.tensor([e.size(0) for e in ref_embeds], device=ref.device)
+        hyp_mask = torch.arange(hyp.size(1), device=hyp.device)[None, :] < hyp_lengths[:, None]
+        ref_mask = torch.arange(ref.size(1), device=ref.device)[None, :] < ref_lengths[:, None]
+
+        if self._bertscore_f1_fn is None:
+            self._bertscore_f1_fn = _bertscore_f1
+            if self.bertscore_compile and hasattr(torch, 'compile'):
+                self._bertscore_f1_fn = torch.compile(_bertscore_f1, dynamic=True)
+
+        with self._compile_guard():
+            return self._bertscore_f1_fn(hyp, ref, hyp_mask, ref_mask).float().tolist()
+
+    def _calculate_bertscore_library(
+        self,
+        references: List[str],
+        hypotheses: List[str]
+    ) -> List[Optional[float]]:
+        """
+        Calculate baseline-rescaled BERTScore with the bert_score library.
 
+        Uses one persistent BERTScorer so the model and baseline files are
+        loaded once rather than on every call.
+
+        Args:
+            references: Gold summaries
+            hypotheses: Generated summaries
+
+        Returns:
+            List of BERTScore F1 values (None entries if failed)
+        """
+        scorer = self._get_bert_scorer()
+
+        if not scorer:
+            return [None] * len(references)
+
+        try:
+            _, _, f1 = scorer.score(
+                hypotheses, references, batch_size=self.batch_size, verbose=self.show_progress
+            )
+            return f1.tolist()
         except Exception as e:
             print(f"Warning: BERTScore calculation failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            return [None] * len(references)
+
+    @staticmethod
+    def _content_token_mask(attention_mask):
+        """
+        Build a boolean mask over real tokens, excluding CLS and SEP.
+
+        Args:
+            attention_mask: Tokenizer attention mask [batch, seq_len]
+
+        Returns:
+            Boolean tensor [batch, seq_len]
+        """
+        import torch
+
+        mask = attention_mask.bool().clone()
+        lengths = attention_mask.sum(dim=1)
+        rows = torch.arange(mask.size(0), device=mask.device)
+
+        # Drop CLS (first) and SEP (last real token)
+        mask[:, 0] = False
+        mask[rows, (lengths - 1).clamp_min(0)] = False
+
+        return mask
 
     def calculate_bleurt(
         self,
@@ -206,7 +655,7 @@ class ContentMetricsCalculator:
         Returns:
             BLEURT score or None if disabled/failed
         """
-        if not self.content_config.get('use_bleurt', True):
+        if not self._use_bleurt:
             return None
 
         self._init_bleurt()
@@ -224,6 +673,49 @@ class ContentMetricsCalculator:
             print(f"Warning: BLEURT calculation failed: {e}")
             return None
 
+    def calculate_bleurt_batch(
+        self,
+        references: List[str],
+        hypotheses: List[str]
+    ) -> List[Optional[float]]:
+        """
+        Calculate BLEURT scores for a batch of pairs in one scorer call.
+
+        Args:
+            references: Gold summaries
+            hypotheses: Generated summaries
+
+        Returns:
+            List of BLEURT scores (None entries if disabled/failed)
+        """
+        if not self._use_bleurt or not references:
+            return [None] * len(references)
+
+        self._init_bleurt()
+
+        if not self.bleurt_scorer:
+            return [None] * len(references)
+
+        # Score in slices of several batches so progress can be reported;
+        # each slice stays large enough for length batching to pay off
+        step = self.batch_size * BLEURT_BATCHES_PER_STEP
+        try:
+            scores = []
+            with tqdm(
+                total=len(references), desc='  BLEURT', unit='pair', disable=not self.show_progress
+            ) as progress:
+                for start in range(0, len(references), step):
+                    scores.extend(self.bleurt_scorer.score(
+                        references=references[start:start + step],
+                        candidates=hypotheses[start:start + step],
+                        batch_size=self.batch_size
+                    ))
+                    progress.update(min(step, len(references) - start))
+            return scores
+        except Exception as e:
+            print(f"Warning: BLEURT calculation failed: {e}")
+            return [None] * len(references)
+
     def calculate_all_metrics(
         self,
         source_text: str,
@@ -241,19 +733,33 @@ class ContentMetricsCalculator:
         Returns:
             Dictionary with all metrics
         """
-        metrics = {}
+        return self.calculate_all_metrics_batch([source_text], [reference], [hypothesis])[0]
 
-        # ROUGE
-        rouge_scores = self.calculate_rouge(reference, hypothesis)
-        metrics.update(rouge_scores)
+    def calculate_lexical_metrics(
+        self,
+        source_text: str,
+        reference: str,
+        hypothesis: str
+    ) -> Dict[str, Any]:
+        """
+        Calculate the model-free content metrics (ROUGE and token counts).
+
+        These are pure CPU work and independent per example, so they can be
+        computed in worker processes and passed to calculate_all_metrics_batch.
+
+        Args:
+            source_text: Source document
+            reference: Gold summary
+            hypothesis: Generated summary
 
-        # BERTScore
-        bertscore_f1 = self.calculate_bertscore(reference, hypothesis)
-        metrics['bertscore_f1'] = bertscore_f1
+        Returns:
+            Dictionary with ROUGE scores, token counts and compression ratio
+        """
+        metrics = {}
 
-        # BLEURT
-        bleurt_score = self.calculate_bleurt(reference, hypothesis)
-        metrics['bleurt'] = bleurt_score
+        # ROUGE
+        if self._use_rouge:
+            metrics.update(self.calculate_rouge(reference, hypothesis))
 
         # Token counts and compression ratio
         src_tokens = count_tokens(source_text)
@@ -265,18 +771,92 @@ class ContentMetricsCalculator:
         metrics['gold_tokens'] = gold_tokens
         metrics['compression_ratio'] = hyp_tokens / src_tokens if src_tokens > 0 else 0.0
 
-        # Composite score
-        rougeLsum_f = metrics.get('rougeLsum_f', 0.0)
-        bertscore = bertscore_f1 if bertscore_f1 is not None else 0.0
-        bleurt = bleurt_score if bleurt_score is not None else 0.0
+        return metrics
 
-        # Normalize BLEURT to 0-1 range (BLEURT typically ranges from -1 to 1)
-        bleurt_normalized = (bleurt + 1) / 2 if bleurt is not None else 0.0
+    def calculate_all_metrics_batch(
+        self,
+        source_texts: List[str],
+        references: List[str],
+        hypotheses: List[str],
+        lexical_metrics: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate all content metrics for a batch of examples.
 
-        metrics['content_quality'] = (
-            0.4 * rougeLsum_f +
-            0.3 * bertscore +
-            0.3 * bleurt_normalized
-        )
+        BERTScore and BLEURT are computed for the whole batch at once, with
+        duplicate (reference, hypothesis) pairs scored only once; the
+        remaining metrics are computed per example. Disabled metrics are
+        skipped entirely (bertscore_f1 and bleurt are then None), and
+        content_quality weights are renormalized over the enabled metrics;
+        it is NaN when no content metric is enabled.
 
-        return metrics
+        Args:
+            source_texts: Source documents
+            references: Gold summaries
+            hypotheses: Generated summaries
+            lexical_metrics: Precomputed results of calculate_lexical_metrics,
+                one per example (computed here if omitted)
+
+        Returns:
+            List of metric dictionaries, one per example
+        """
+        n = len(references)
+        if lexical_metrics is None:
+            lexical_metrics = [
+                self.calculate_lexical_metrics(source_text, reference, hypothesis)
+                for source_text, reference, hypothesis in zip(source_texts, references, hypotheses)
+            ]
+
+        # Score each distinct (reference, hypothesis) pair once and map the
+        # results back; duplicate pairs come from re-runs of the same document
+        pair_index: Dict[tuple, int] = {}
+        inverse = [pair_index.setdefault(pair, len(pair_index)) for pair in zip(references, hypotheses)]
+        unique_refs = [reference for reference, _ in pair_index]
+        unique_hyps = [hypothesis for _, hypothesis in pair_index]
+
+        if self._use_bertscore:
+            unique_bertscores = self.calculate_bertscore_batch(unique_refs, unique_hyps)
+            bertscores = [unique_bertscores[j] for j in inverse]
+        else:
+            bertscores = [None] * n
+
+        if self._use_bleurt:
+            unique_bleurt_scores = self.calculate_bleurt_batch(unique_refs, unique_hyps)
+            bleurt_scores = [unique_bleurt_scores[j] for j in inverse]
+        else:
+            bleurt_scores = [None] * n
+
+        weights = self._content_quality_weights
+
+        results = []
+        for lexical, bertscore_f1, bleurt_score in zip(lexical_metrics, bertscores, bleurt_scores):
+            metrics = dict(lexical)
+            components = {}
+
+            # ROUGE
+            if self._use_rouge:
+                components['rouge'] = lexical.get('rougeLsum_f', 0.0)
+
+            # BERTScore
+            metrics['bertscore_f1'] = bertscore_f1
+            if self._use_bertscore:
+                components['bertscore'] = bertscore_f1 if bertscore_f1 is not None else 0.0
+
+            # BLEURT
+            metrics['bleurt'] = bleurt_score
+            if self._use_bleurt:
+                bleurt = bleurt_score if bleurt_score is not None else 0.0
+                # Normalize BLEURT to 0-1 range (BLEURT typically ranges from -1 to 1)
+                components['bleurt'] = (bleurt + 1) / 2
+
+            # Composite score over enabled metrics
+            if weights:
+                metrics['content_quality'] = sum(
+                    weights[k] * components[k] for k in weights
+                )
+            else:
+                metrics['content_quality'] = float('nan')
+
+            results.append(metrics)
+
+        return results
@@ -3,48 +3,110 @@ Main evaluation runner - works directly with JSON files (no YAML config needed).
 """
 
 import argparse
+import csv
 import json
+import os
+import warnings
+import numpy as np
 import pandas as pd
+from tqdm import tqdm
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 
 from src.io_utils import load_all_records
-from src.content_metrics import ContentMetricsCalculator
-from src.style_features import StyleAnalyzer
-from src.text_utils import count_tokens
+
+# The metric modules import rouge_score at load time (which itself imports
+# NLTK, and SciPy through NLTK when it is installed); torch is loaded on
+# first BERTScore use. They are imported inside main() and the workers so
+# that --help and bad arguments or data paths fail fast
+if TYPE_CHECKING:
+    from src.content_metrics import ContentMetricsCalculator
+    from src.style_features import StyleAnalyzer
+
+
+# Per-process state for the CPU-only evaluation workers (set by _init_worker)
+_worker_content_calculator: Optional['ContentMetricsCalculator'] = None
+_worker_style_analyzer: Optional['StyleAnalyzer'] = None
+
+
+def _init_worker(
+    content_config: Dict[str, Any],
+    persona_config: Dict[str, Any],
+    centroids: Dict[str, Any]
+):
+    """
+    Set up the calculators used by _eval_cpu_only in this process.
+
+    Centroids are passed once per worker instead of once per task. The
+    worker's content calculator never loads BERTScore or BLEURT; those run
+    batched in the main process.
+
+    Args:
+        content_config: Content metrics settings
+        persona_config: Persona corpus paths
+        centroids: Prebuilt persona centroids
+    """
+    global _worker_content_calculator, _worker_style_analyzer
+
+    from src.content_metrics import ContentMetricsCalculator
+    from src.style_features import StyleAnalyzer
+
+    _worker_content_calculator = ContentMetricsCalculator({
+        'content': {**content_config, 'use_bertscore': False, 'use_bleurt': False}
+    })
+    _worker_style_analyzer = StyleAnalyzer(persona_config)
+    _worker_style_analyzer.centroids = centroids
+
+
+def _eval_cpu_only(records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Optional[float]]]:
+    """
+    Calculate the model-free metrics for a chunk of records.
+
+    Style similarity for the whole chunk is computed in one batched call.
+
+    Args:
+        records: Processed records with all fields
+
+    Returns:
+        List of (lexical content metrics, style similarity), one per record
+    """
+    lexical_metrics = [
+        _worker_content_calculator.calculate_lexical_metrics(
+            record['document_content'],
+            record['expected_summary'],
+            record['generated_summary']
+        )
+        for record in records
+    ]
+    style_similarities = _worker_style_analyzer.calculate_style_similarity_batch(
+        [record['generated_summary'] for record in records],
+        [record['persona'] for record in records]
+    )
+
+    return list(zip(lexical_metrics, style_similarities))
 
 
 def evaluate_single_item(
     record: Dict[str, Any],
-    content_calc: ContentMetricsCalculator,
-    style_analyzer: StyleAnalyzer
+    content_metrics: Dict[str, Any],
+    style_similarity: Optional[float]
 ) -> Dict[str, Any]:
     """
     Evaluate a single record.
 
     Args:
         record: Processed record with all fields
-        content_calc: Content metrics calculator
-        style_analyzer: Style analyzer
+        content_metrics: Precomputed content metrics for this record
+            (from ContentMetricsCalculator.calculate_all_metrics_batch)
+        style_similarity: Precomputed style similarity for this record
 
     Returns:
         Dictionary with all metrics
     """
-    source_text = record['document_content']
-    reference = record['expected_summary']
-    generated = record['generated_summary']
     persona = record['persona']
 
-    # Calculate content metrics
-    content_metrics = content_calc.calculate_all_metrics(
-        source_text=source_text,
-        reference=reference,
-        hypothesis=generated
-    )
-
-    # Calculate style similarity
-    style_similarity = style_analyzer.calculate_style_similarity(generated, persona)
-
     # Calculate overall quality (combined metric)
     # Weighted combination: 70% content quality, 30% style fidelity
     content_quality = content_metrics.get('content_quality', 0.0)
@@ -79,48 +141,84 @@ def evaluate_single_item(
     return result
 
 
-def calculate_aggregates(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+# Text columns kept alongside the numeric metrics for grouped aggregates
+GROUP_KEYS = ('persona', 'sector', 'model_used')
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a result value belongs in a numeric metric column."""
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+# NaN-aware column reductions, matching pandas' skipna defaults
+_STAT_FUNCS = {
+    'mean': np.nanmean,
+    'median': np.nanmedian,
+    'std': lambda block, axis: np.nanstd(block, axis=axis, ddof=1),
+    'min': np.nanmin,
+    'max': np.nanmax,
+    'count': lambda block, axis: np.count_nonzero(~np.isnan(block), axis=axis),
+}
+
+
+def _block_stats(
+    block: np.ndarray,
+    numeric_cols: List[str],
+    stats: List[str]
+) -> Dict[str, Dict[str, float]]:
     """
-    Calculate aggregate statistics.
+    Column-wise statistics over a (rows, columns) block of metric values.
 
     Args:
-        results: List of evaluation results
+        block: Numeric metric values, NaN where missing
+        numeric_cols: Column names for the block's columns
+        stats: Statistics to compute (keys of _STAT_FUNCS)
 
     Returns:
-        Dictionary with aggregate statistics
+        Dictionary mapping metric -> stat -> value
     """
-    df = pd.DataFrame(results)
+    # All-NaN columns (e.g. a failed metric) give NaN like pandas; silence
+    # numpy's empty-slice warnings for them
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        values = {stat: _STAT_FUNCS[stat](block, axis=0).tolist() for stat in stats}
+
+    return {
+        col: {stat: values[stat][j] for stat in stats}
+        for j, col in enumerate(numeric_cols)
+    }
 
-    # Overall statistics
-    numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
-    overall_stats = df[numeric_cols].agg(['mean', 'median', 'std', 'min', 'max']).to_dict()
 
-    # Per-persona statistics
-    persona_stats = {}
-    for persona in df['persona'].unique():
-        persona_df = df[df['persona'] == persona]
-        persona_stats[persona] = persona_df[numeric_cols].agg(['mean', 'median', 'std', 'count']).to_dict()
-
-    # Per-sector statistics
-    sector_stats = {}
-    for sector in df['sector'].unique():
-        if sector:  # Skip empty sectors
-            sector_df = df[df['sector'] == sector]
-            sector_stats[sector] = sector_df[numeric_cols].agg(['mean', 'count']).to_dict()
-
-    # Per-model statistics
-    model_stats = {}
-    for model in df['model_used'].unique():
-        if model:  # Skip empty models
-            model_df = df[df['model_used'] == model]
-            model_stats[model] = model_df[numeric_cols].agg(['mean', 'count']).to_dict()
+def calculate_aggregates(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Calculate aggregate statistics.
+
+    Numeric columns are converted once into a single contiguous array;
+    overall and per-group statistics are computed on row slices of it.
+
+    Args:
+        df: Per-item evaluation results
+
+    Returns:
+        Dictionary with aggregate statistics
+    """
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    block = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def group_stats(key: str, stats: List[str]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        # Empty values are skipped; groupby already drops missing keys
+        return {
+            group: _block_stats(block[rows], numeric_cols, stats)
+            for group, rows in df.groupby(key).indices.items()
+            if group != ''
+        }
 
     return {
-        'overall': overall_stats,
-        'by_persona': persona_stats,
-        'by_sector': sector_stats,
-        'by_model': model_stats,
-        'total_items': len(results)
+        'overall': _block_stats(block, numeric_cols, ['mean', 'median', 'std', 'min', 'max']),
+        'by_persona': group_stats('persona', ['mean', 'median', 'std', 'count']),
+        'by_sector': group_stats('sector', ['mean', 'count']),
+        'by_model': group_stats('model_used', ['mean', 'count']),
+        'total_items': len(df)
     }
 
 
@@ -152,12 +250,31 @@ def main():
         default='roberta-large',
         help='BERTScore model (default: roberta-large)'
     )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=64,
+        help='Batch size for BERTScore/BLEURT inference (default: 64)'
+    )
+    parser.add_argument(
+        '--bertscore-cache-dir',
+        type=str,
+        default=None,
+        help='Directory for an on-disk BERTScore embedding cache shared across '
+             'runs; it is not size-bounded (default: disabled)'
+    )
     parser.add_argument(
         '--use-bleurt',
         action='store_true',
         default=False,
         help='Use BLEURT (default: False, requires setup)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes for ROUGE/style metrics (default: CPU count)'
+    )
 
     args = parser.parse_args()
 
@@ -177,25 +294,27 @@ def main():
     print()
 
     # Show persona distribution
-    persona_counts = {}
-    for r in records:
-        p = r['persona']
-        persona_counts[p] = persona_counts.get(p, 0) + 1
+    persona_counts = Counter(r['persona'] for r in records)
 
     print("Persona distribution:")
-    for persona, count in sorted(persona_counts.items()):
+    for persona, count in persona_counts.most_common():
         print(f"  {persona:20s}: {count:2d} records")
     print()
 
     # Initialize calculators
     print("Initializing metrics calculators...")
+    from src.content_metrics import ContentMetricsCalculator
+    from src.style_features import StyleAnalyzer
 
     content_config = {
         'use_rouge': True,
         'use_bertscore': args.use_bertscore,
         'bertscore_model': args.bertscore_model,
         'use_bleurt': args.use_bleurt,
-        'bleurt_checkpoint': 'bleurt_checkpoints/BLEURT-20-D3'
+        'bleurt_checkpoint': 'bleurt_checkpoints/BLEURT-20-D3',
+        'batch_size': args.batch_size,
+        'show_progress': True,
+        'bertscore_cache_dir': args.bertscore_cache_dir
     }
 
     content_calculator = ContentMetricsCalculator({'content': content_config})
@@ -216,33 +335,111 @@ def main():
     print(f"✓ Built centroids for {len(centroids)} personas")
     print()
 
+    # ROUGE, token counts and style similarity are independent per record,
+    # so spread them over worker processes. This runs before any model is
+    # loaded in the main process.
+    workers = max(1, min(args.workers, len(records)))
+    print(f"Calculating lexical and style metrics ({workers} workers)...")
+    init_args = (content_config, persona_config, centroids)
+    chunks = [records[i:i + 8] for i in range(0, len(records), 8)]
+    chunk_results: List[Any] = [None] * len(chunks)
+    # tqdm redraws at most ~10 times a second; advanced as chunks finish
+    with tqdm(total=len(records), desc='  lexical/style', unit='record') as progress:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as ex:
+                futures = {ex.submit(_eval_cpu_only, chunk): i for i, chunk in enumerate(chunks)}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    chunk_results[i] = future.result()
+                    progress.update(len(chunks[i]))
+        else:
+            _init_worker(*init_args)
+            for i, chunk in enumerate(chunks):
+                chunk_results[i] = _eval_cpu_only(chunk)
+                progress.update(len(chunk))
+    cpu_results = [result for chunk in chunk_results for result in chunk]
+
+    # BERTScore/BLEURT for the whole corpus in one batch
+    print(f"Calculating content metrics for {len(records)} records...")
+    all_content_metrics = content_calculator.calculate_all_metrics_batch(
+        source_texts=[r['document_content'] for r in records],
+        references=[r['expected_summary'] for r in records],
+        hypotheses=[r['generated_summary'] for r in records],
+        lexical_metrics=[lexical for lexical, _ in cpu_results]
+    )
+    print()
+
     # Process each record
     print(f"Evaluating {len(records)} records...")
     print()
-    results = []
-
-    for i, record in enumerate(records, 1):
-        title = record['document_title'][:50]
-        print(f"  [{i}/{len(records)}] {title}...")
-
-        result = evaluate_single_item(record, content_calculator, style_analyzer)
-        results.append(result)
+    # Rows are streamed to CSV as they are evaluated. For aggregation only
+    # the numeric metrics (in preallocated float arrays) and the grouping
+    # keys are kept, not the text fields.
+    output_csv = output_dir / 'per_item_metrics.csv'
+    n = len(records)
+    numeric: Dict[str, np.ndarray] = {}
+    has_number = set()  # numeric columns with at least one non-None value
+    groups: Dict[str, List[Any]] = {key: [] for key in GROUP_KEYS}
+
+    with open(output_csv, 'w', newline='') as f:
+        writer = None
+
+        for i, (record, content_metrics, (_, style_similarity)) in enumerate(
+            zip(records, all_content_metrics, cpu_results)
+        ):
+            result = evaluate_single_item(record, content_metrics, style_similarity)
+
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(result.keys()), lineterminator='\n')
+                writer.writeheader()
+                numeric = {
+                    key: np.full(n, np.nan)
+                    for key, value in result.items()
+                    if key not in GROUP_KEYS and (value is None or _is_number(value))
+                }
+
+            for key in list(numeric):
+                value = result[key]
+                if value is None:
+                    continue
+                if _is_number(value):
+                    numeric[key][i] = value
+                    has_number.add(key)
+                else:
+                    # Not a numeric column after all (e.g. an id field)
+                    del numeric[key]
+            for key in GROUP_KEYS:
+                groups[key].append(result[key])
+
+            # NaN is written as an empty field, as pandas' to_csv does
+            writer.writerow({
+                key: '' if isinstance(value, float) and value != value else value
+                for key, value in result.items()
+            })
+
+            if (i + 1) % 50 == 0:
+                f.flush()
 
     print()
     print("✓ Evaluation complete!")
     print()
 
-    # Save results
-    output_csv = output_dir / 'per_item_metrics.csv'
-    df = pd.DataFrame(results)
-    df.to_csv(output_csv, index=False)
+    # Columns that were None throughout carry no numbers and are left out,
+    # as pandas would have given them object dtype
+    df = pd.DataFrame({
+        **{key: values for key, values in numeric.items() if key in has_number},
+        **groups
+    })
     print(f"✓ Saved per-item metrics to {output_csv}")
 
     # Calculate and save aggregates
-    aggregates = calculate_aggregates(results)
+    aggregates = calculate_aggregates(df)
     output_json = output_dir / 'corpus_aggregates.json'
+    # Aggregates hold only plain Python numbers, so no default= fallback is
+    # needed; serialize to one string and write it in a single call
+    # (json.dump issues a write per encoded fragment)
     with open(output_json, 'w') as f:
-        json.dump(aggregates, f, indent=2, default=str)
+        f.write(json.dumps(aggregates, indent=2))
     print(f"✓ Saved aggregate statistics to {output_json}")
 
     # Print summary
@@ -250,7 +447,7 @@ def main():
     print("="*80)
     print("EVALUATION SUMMARY")
     print("="*80)
-    print(f"Total items evaluated: {len(results)}")
+    print(f"Total items evaluated: {len(df)}")
     print()
 
     # Overall metrics
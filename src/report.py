@@ -4,9 +4,27 @@ Report generation from evaluation metrics.
 
 import argparse
 import json
-import pandas as pd
 from pathlib import Path
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, List
+
+# pandas is imported where it is used so that importing this module (or
+# --help) stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Per-item columns read by generate_report; other metric columns are skipped
+# at parse time
+REPORT_COLUMNS = frozenset({
+    'write_id', 'document_title', 'persona_id', 'style_skipped',
+    'content_quality', 'rougeLsum_f', 'bertscore_f1', 'style_similarity'
+})
+
+# Ranking column -> columns shown in its top/bottom tables
+RANKED_TABLES = {
+    'content_quality': ['write_id', 'document_title', 'content_quality', 'rougeLsum_f', 'bertscore_f1'],
+    'style_similarity': ['write_id', 'document_title', 'persona_id', 'style_similarity'],
+}
 
 
 def format_metric_table(metrics: Dict[str, Dict[str, float]], title: str) -> str:
@@ -44,6 +62,120 @@ def format_metric_table(metrics: Dict[str, Dict[str, float]], title: str) -> str
     return "\n".join(lines)
 
 
+def df_to_md(df: 'pd.DataFrame', float_cols: List[str] = ()) -> str:
+    """
+    Format a DataFrame as a markdown table without going through tabulate.
+
+    Args:
+        df: Rows to format
+        float_cols: Columns formatted with 4 decimal places
+
+    Returns:
+        Markdown formatted table string
+    """
+    import pandas as pd
+
+    float_cols = set(float_cols)
+    formats = [
+        (lambda v: 'nan' if pd.isna(v) else f"{v:.4f}") if col in float_cols
+        else (lambda v: str(v).replace('|', '\\|'))
+        for col in df.columns
+    ]
+
+    lines = ["| " + " | ".join(df.columns) + " |"]
+    lines.append("|" + "|".join("---:" if col in float_cols else "---" for col in df.columns) + "|")
+    for row in df.itertuples(index=False):
+        lines.append("| " + " | ".join(fmt(v) for fmt, v in zip(formats, row)) + " |")
+
+    return "\n".join(lines)
+
+
+def _top_bottom(df: 'pd.DataFrame', column: str, columns: List[str], n: int = 5):
+    """
+    Get the top and bottom rows by a column.
+
+    Both orders are stable, so tied rows keep their original order, as
+    with nlargest/nsmallest(keep='first').
+
+    Args:
+        df: Per-item metrics
+        column: Column to rank by (rows where it is missing are skipped)
+        columns: Columns to keep in the result
+        n: Number of rows in each table
+
+    Returns:
+        Tuple of (top n descending, bottom n ascending) DataFrames
+    """
+    ranked = df.loc[df[column].notna(), columns]
+    top = ranked.sort_values(column, ascending=False, kind='stable').head(n)
+    bottom = ranked.sort_values(column, kind='stable').head(n)
+    return top, bottom
+
+
+def _scan_metrics(metrics_csv: str, chunksize: int = 200_000) -> Dict[str, Any]:
+    """
+    Read the per-item metrics CSV in chunks, keeping only what the report uses.
+
+    Running sums/counts and the rows that can still reach a top/bottom
+    table are folded per chunk, so memory is bounded by the chunk size
+    rather than the size of the file.
+
+    Args:
+        metrics_csv: Path to per_item_metrics.csv
+        chunksize: Rows parsed per chunk
+
+    Returns:
+        Dictionary with n_items, columns, means, style_evaluated,
+        style_skipped and ranked ({column: (top, bottom)})
+    """
+    import pandas as pd
+
+    n_items = 0
+    columns = set()
+    sums: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    style_evaluated = 0
+    style_skipped = 0
+    candidates: Dict[str, 'pd.DataFrame'] = {}
+
+    # Only the columns the report uses are parsed
+    reader = pd.read_csv(metrics_csv, usecols=lambda column: column in REPORT_COLUMNS, chunksize=chunksize)
+    for chunk in reader:
+        n_items += len(chunk)
+        columns.update(chunk.columns)
+        skipped_counts = chunk['style_skipped'].value_counts()
+        style_evaluated += int(skipped_counts.get(0, 0))
+        style_skipped += int(skipped_counts.get(1, 0))
+
+        for column in ('content_quality', 'style_similarity'):
+            if column in chunk.columns:
+                sums[column] = sums.get(column, 0.0) + chunk[column].sum()
+                counts[column] = counts.get(column, 0) + int(chunk[column].count())
+
+        # Keep the current top/bottom rows as candidates for the next chunk
+        # (the row index keeps counting across chunks)
+        for column, table_columns in RANKED_TABLES.items():
+            if column in chunk.columns:
+                pool = pd.concat([candidates[column], chunk]) if column in candidates else chunk
+                top, bottom = _top_bottom(pool, column, table_columns)
+                candidates[column] = pool.loc[top.index.union(bottom.index)]
+
+    return {
+        'n_items': n_items,
+        'columns': columns,
+        'means': {
+            column: sums[column] / counts[column] if counts[column] else float('nan')
+            for column in sums
+        },
+        'style_evaluated': style_evaluated,
+        'style_skipped': style_skipped,
+        'ranked': {
+            column: _top_bottom(pool, column, RANKED_TABLES[column])
+            for column, pool in candidates.items()
+        },
+    }
+
+
 def generate_report(metrics_csv: str, aggregates_json: str, output_path: str):
     """
     Generate markdown report from evaluation results.
@@ -54,17 +186,38 @@ def generate_report(metrics_csv: str, aggregates_json: str, output_path: str):
         output_path: Path to output report.md
     """
     # Load data
-    df = pd.read_csv(metrics_csv)
+    metrics = _scan_metrics(metrics_csv)
     with open(aggregates_json, 'r') as f:
         aggregates = json.load(f)
 
-    # Start building report
-    lines = []
-    lines.append("# Persona Summarization Evaluation Report\n")
-    lines.append(f"**Total Items Evaluated:** {len(df)}\n")
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write the report straight to a block-buffered file as it is built
+    with open(output_path, 'w', buffering=1 << 20) as f:
+        _write_report(f, metrics, aggregates)
+
+    print(f"Report generated: {output_path}")
+
+
+def _write_report(f, metrics: Dict[str, Any], aggregates: Dict[str, Any]):
+    """
+    Write the markdown report sections to an open file.
+
+    Args:
+        f: Text file opened for writing
+        metrics: Per-item metric summary from _scan_metrics
+        aggregates: Corpus aggregate statistics
+    """
+    def write(line: str):
+        f.write(line)
+        f.write('\n')
+
+    write("# Persona Summarization Evaluation Report\n")
+    write(f"**Total Items Evaluated:** {metrics['n_items']}\n")
 
     # Overall statistics
-    lines.append("## Overall Statistics\n")
+    write("## Overall Statistics\n")
 
     overall = aggregates.get('overall', {})
 
@@ -74,22 +227,22 @@ def generate_report(metrics_csv: str, aggregates_json: str, output_path: str):
         if k in ['rouge1_f', 'rouge2_f', 'rougeLsum_f', 'rouge1_r', 'rougeLsum_r',
                  'bertscore_f1', 'bleurt', 'content_quality', 'compression_ratio']
     }
-    lines.append(format_metric_table(content_metrics, "Content Quality Metrics"))
+    write(format_metric_table(content_metrics, "Content Quality Metrics"))
 
     # Style metrics
     style_metrics = {
         k: v for k, v in overall.items()
         if k in ['style_similarity', 'style_fidelity']
     }
-    lines.append(format_metric_table(style_metrics, "Style Fidelity Metrics"))
+    write(format_metric_table(style_metrics, "Style Fidelity Metrics"))
 
     # Per-persona breakdown
     by_persona = aggregates.get('by_persona', {})
     if by_persona:
-        lines.append("## Per-Persona Results\n")
+        write("## Per-Persona Results\n")
 
         for persona_id, persona_metrics in by_persona.items():
-            lines.append(f"### Persona: {persona_id}\n")
+            write(f"### Persona: {persona_id}\n")
 
             # Filter content metrics
             persona_content = {
@@ -105,88 +258,68 @@ def generate_report(metrics_csv: str, aggregates_json: str, output_path: str):
             }
 
             if persona_content:
-                lines.append("#### Content Metrics\n")
-                lines.append("| Metric | Mean | Median | Std Dev | Count |")
-                lines.append("|--------|------|--------|---------|-------|")
+                write("#### Content Metrics\n")
+                write("| Metric | Mean | Median | Std Dev | Count |")
+                write("|--------|------|--------|---------|-------|")
                 for metric_name, stats in persona_content.items():
                     mean = stats.get('mean', 0)
                     median = stats.get('median', 0)
                     std = stats.get('std', 0)
                     count = stats.get('count', 0)
-                    lines.append(f"| {metric_name} | {mean:.4f} | {median:.4f} | {std:.4f} | {count} |")
-                lines.append("\n")
+                    write(f"| {metric_name} | {mean:.4f} | {median:.4f} | {std:.4f} | {count} |")
+                write("\n")
 
             if persona_style:
-                lines.append("#### Style Metrics\n")
-                lines.append("| Metric | Mean | Median | Std Dev | Count |")
-                lines.append("|--------|------|--------|---------|-------|")
+                write("#### Style Metrics\n")
+                write("| Metric | Mean | Median | Std Dev | Count |")
+                write("|--------|------|--------|---------|-------|")
                 for metric_name, stats in persona_style.items():
                     mean = stats.get('mean', 0)
                     median = stats.get('median', 0)
                     std = stats.get('std', 0)
                     count = stats.get('count', 0)
-                    lines.append(f"| {metric_name} | {mean:.4f} | {median:.4f} | {std:.4f} | {count} |")
-                lines.append("\n")
+                    write(f"| {metric_name} | {mean:.4f} | {median:.4f} | {std:.4f} | {count} |")
+                write("\n")
 
     # Top and bottom performers
-    lines.append("## Performance Analysis\n")
-
-    # Top 5 by content quality
-    if 'content_quality' in df.columns:
-        top_content = df.nlargest(5, 'content_quality')[
-            ['write_id', 'document_title', 'content_quality', 'rougeLsum_f', 'bertscore_f1']
-        ]
-        lines.append("### Top 5 Summaries by Content Quality\n")
-        lines.append(top_content.to_markdown(index=False))
-        lines.append("\n")
-
-        # Bottom 5 by content quality
-        bottom_content = df.nsmallest(5, 'content_quality')[
-            ['write_id', 'document_title', 'content_quality', 'rougeLsum_f', 'bertscore_f1']
-        ]
-        lines.append("### Bottom 5 Summaries by Content Quality\n")
-        lines.append(bottom_content.to_markdown(index=False))
-        lines.append("\n")
+    write("## Performance Analysis\n")
 
-    # Style similarity analysis
-    if 'style_similarity' in df.columns:
-        df_with_style = df[df['style_similarity'].notna()]
-        if len(df_with_style) > 0:
-            top_style = df_with_style.nlargest(5, 'style_similarity')[
-                ['write_id', 'document_title', 'persona_id', 'style_similarity']
-            ]
-            lines.append("### Top 5 Summaries by Style Similarity\n")
-            lines.append(top_style.to_markdown(index=False))
-            lines.append("\n")
-
-            bottom_style = df_with_style.nsmallest(5, 'style_similarity')[
-                ['write_id', 'document_title', 'persona_id', 'style_similarity']
-            ]
-            lines.append("### Bottom 5 Summaries by Style Similarity\n")
-            lines.append(bottom_style.to_markdown(index=False))
-            lines.append("\n")
+    # Top and bottom 5 by content quality
+    ranked = metrics['ranked']
+    if 'content_quality' in ranked:
+        content_float_cols = ['content_quality', 'rougeLsum_f', 'bertscore_f1']
+        top_content, bottom_content = ranked['content_quality']
+        write("### Top 5 Summaries by Content Quality\n")
+        write(df_to_md(top_content, content_float_cols))
+        write("\n")
 
-    # Summary statistics
-    lines.append("## Summary\n")
-    lines.append(f"- **Items with style evaluation:** {df['style_skipped'].eq(0).sum()} / {len(df)}\n")
-    lines.append(f"- **Items skipped for style:** {df['style_skipped'].eq(1).sum()}\n")
+        write("### Bottom 5 Summaries by Content Quality\n")
+        write(df_to_md(bottom_content, content_float_cols))
+        write("\n")
 
-    if 'content_quality' in df.columns:
-        avg_quality = df['content_quality'].mean()
-        lines.append(f"- **Average content quality:** {avg_quality:.4f}\n")
+    # Style similarity analysis
+    if 'style_similarity' in ranked and not ranked['style_similarity'][0].empty:
+        top_style, bottom_style = ranked['style_similarity']
+        write("### Top 5 Summaries by Style Similarity\n")
+        write(df_to_md(top_style, ['style_similarity']))
+        write("\n")
 
-    if 'style_similarity' in df.columns:
-        avg_style = df['style_similarity'].mean()
-        lines.append(f"- **Average style similarity:** {avg_style:.4f}\n")
+        write("### Bottom 5 Summaries by Style Similarity\n")
+        write(df_to_md(bottom_style, ['style_similarity']))
+        write("\n")
 
-    # Write report
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Summary statistics
+    write("## Summary\n")
+    write(f"- **Items with style evaluation:** {metrics['style_evaluated']} / {metrics['n_items']}\n")
+    write(f"- **Items skipped for style:** {metrics['style_skipped']}\n")
 
-    with open(output_path, 'w') as f:
-        f.write('\n'.join(lines))
+    if 'content_quality' in metrics['columns']:
+        avg_quality = metrics['means']['content_quality']
+        write(f"- **Average content quality:** {avg_quality:.4f}\n")
 
-    print(f"Report generated: {output_path}")
+    if 'style_similarity' in metrics['columns']:
+        avg_style = metrics['means']['style_similarity']
+        write(f"- **Average style similarity:** {avg_style:.4f}\n")
 
 
 def main():
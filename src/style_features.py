@@ -2,24 +2,123 @@
 Style and persona fidelity metrics using stylometric features.
 """
 
-import json
+import functools
 import numpy as np
+from collections import Counter
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from scipy.spatial.distance import jensenshannon
 from src.text_utils import (
-    tokenize_sentences,
-    tokenize_words,
+    count_sentences_words,
     get_function_words,
     get_pronouns,
-    calculate_flesch_kincaid_grade,
+    flesch_kincaid_grade_from_tokens,
     get_punctuation_counts
 )
 
 
+def _js_distance(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Jensen-Shannon distance between distributions along the last axis.
+
+    Same result as scipy.spatial.distance.jensenshannon (natural log) for
+    strictly positive, normalized inputs, without SciPy's per-call
+    validation overhead on these 10-element vectors.
+
+    Args:
+        p: Probability distribution(s), all entries > 0
+        q: Probability distribution(s), all entries > 0
+
+    Returns:
+        JS distance (scalar array for 1-D inputs, one per row otherwise)
+    """
+    m = 0.5 * (p + q)
+    js_divergence = 0.5 * ((p * np.log(p / m)).sum(axis=-1) + (q * np.log(q / m)).sum(axis=-1))
+    return np.sqrt(np.maximum(js_divergence, 0.0))
+
+
+@functools.lru_cache(maxsize=4096)
+def _stylometric_features(text: str, function_words: frozenset, pronouns: frozenset) -> tuple:
+    """
+    Compute the stylometric feature values for a text (see
+    StyleAnalyzer.extract_stylometric_features).
+
+    Memoized on the text and word sets: persona corpora and re-evaluated
+    summaries repeat the same strings. Returns a tuple so cached values
+    cannot be mutated by callers.
+
+    Args:
+        text: Input text
+        function_words: Function words to count
+        pronouns: Pronouns to count
+
+    Returns:
+        Tuple of 10 feature values
+    """
+    if not text.strip():
+        return (0.0,) * 10
+
+    # Tokenize once; the counts are shared with the Flesch-Kincaid grade
+    num_sentences, words = count_sentences_words(text)
+    words_lower = [w.lower() for w in words]
+
+    if not words:
+        return (0.0,) * 10
+
+    # Count each distinct word once; set lookups then scale with the
+    # vocabulary instead of the number of tokens
+    word_counts = Counter(words_lower)
+
+    # Feature 1: Function word rate
+    function_word_count = sum(word_counts[w] for w in function_words.intersection(word_counts))
+    function_word_rate = function_word_count / len(words)
+
+    # Feature 2: Average sentence length
+    avg_sentence_length = len(words) / num_sentences if num_sentences else 0
+
+    # Feature 3: Type-token ratio (vocabulary diversity)
+    type_token_ratio = len(word_counts) / len(words) if words else 0
+
+    # Feature 4-7: Punctuation rates
+    punct_counts = get_punctuation_counts(text)
+    total_chars = len(text)
+    comma_rate = punct_counts['comma'] / total_chars if total_chars > 0 else 0
+    period_rate = punct_counts['period'] / total_chars if total_chars > 0 else 0
+    exclamation_rate = punct_counts['exclamation'] / total_chars if total_chars > 0 else 0
+    question_rate = punct_counts['question'] / total_chars if total_chars > 0 else 0
+
+    # Feature 8: Pronoun rate
+    pronoun_count = sum(word_counts[w] for w in pronouns.intersection(word_counts))
+    pronoun_rate = pronoun_count / len(words)
+
+    # Feature 9: Flesch-Kincaid grade
+    fk_grade = flesch_kincaid_grade_from_tokens(num_sentences, words)
+    fk_grade_normalized = min(fk_grade / 20.0, 1.0)  # Normalize to 0-1
+
+    # Feature 10: Average word length
+    avg_word_length = sum(len(w) for w in words) / len(words)
+    avg_word_length_normalized = min(avg_word_length / 10.0, 1.0)
+
+    return (
+        function_word_rate,
+        avg_sentence_length / 50.0,  # Normalize (assume max 50 words/sentence)
+        type_token_ratio,
+        comma_rate * 100,  # Scale up
+        period_rate * 100,
+        exclamation_rate * 100,
+        question_rate * 100,
+        pronoun_rate,
+        fk_grade_normalized,
+        avg_word_length_normalized
+    )
+
+
 class StyleAnalyzer:
     """Analyze stylometric features and calculate persona similarity."""
 
+    # Bumped whenever feature extraction changes, so cached centroids built
+    # by an older version are rebuilt (2: regex tokenization)
+    FEATURE_VERSION = 2
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize style analyzer.
@@ -52,61 +151,7 @@ class StyleAnalyzer:
         Returns:
             Feature vector as numpy array
         """
-        if not text.strip():
-            return np.zeros(10)
-
-        # Tokenize
-        sentences = tokenize_sentences(text)
-        words = tokenize_words(text)
-        words_lower = [w.lower() for w in words]
-
-        if not words:
-            return np.zeros(10)
-
-        # Feature 1: Function word rate
-        function_word_count = sum(1 for w in words_lower if w in self.function_words)
-        function_word_rate = function_word_count / len(words)
-
-        # Feature 2: Average sentence length
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
-
-        # Feature 3: Type-token ratio (vocabulary diversity)
-        type_token_ratio = len(set(words_lower)) / len(words) if words else 0
-
-        # Feature 4-7: Punctuation rates
-        punct_counts = get_punctuation_counts(text)
-        total_chars = len(text)
-        comma_rate = punct_counts['comma'] / total_chars if total_chars > 0 else 0
-        period_rate = punct_counts['period'] / total_chars if total_chars > 0 else 0
-        exclamation_rate = punct_counts['exclamation'] / total_chars if total_chars > 0 else 0
-        question_rate = punct_counts['question'] / total_chars if total_chars > 0 else 0
-
-        # Feature 8: Pronoun rate
-        pronoun_count = sum(1 for w in words_lower if w in self.pronouns)
-        pronoun_rate = pronoun_count / len(words)
-
-        # Feature 9: Flesch-Kincaid grade
-        fk_grade = calculate_flesch_kincaid_grade(text)
-        fk_grade_normalized = min(fk_grade / 20.0, 1.0)  # Normalize to 0-1
-
-        # Feature 10: Average word length
-        avg_word_length = sum(len(w) for w in words) / len(words)
-        avg_word_length_normalized = min(avg_word_length / 10.0, 1.0)
-
-        features = np.array([
-            function_word_rate,
-            avg_sentence_length / 50.0,  # Normalize (assume max 50 words/sentence)
-            type_token_ratio,
-            comma_rate * 100,  # Scale up
-            period_rate * 100,
-            exclamation_rate * 100,
-            question_rate * 100,
-            pronoun_rate,
-            fk_grade_normalized,
-            avg_word_length_normalized
-        ])
-
-        return features
+        return np.array(_stylometric_features(text, frozenset(self.function_words), frozenset(self.pronouns)))
 
     def build_persona_centroids(self, force_rebuild: bool = False) -> Dict[str, np.ndarray]:
         """
@@ -118,14 +163,14 @@ class StyleAnalyzer:
         Returns:
             Dictionary mapping persona_id to centroid vector
         """
-        cache_path = Path('outputs/persona_centroids.json')
+        cache_path = Path('outputs/persona_centroids.npz')
 
-        # Try to load from cache
+        # Try to load from cache (unless built by another feature version)
         if not force_rebuild and cache_path.exists():
-            with open(cache_path, 'r') as f:
-                cached = json.load(f)
-                self.centroids = {k: np.array(v) for k, v in cached.items()}
-                return self.centroids
+            with np.load(cache_path) as cached:
+                if '_feature_version' in cached.files and int(cached['_feature_version']) == self.FEATURE_VERSION:
+                    self.centroids = {k: cached[k] for k in cached.files if k != '_feature_version'}
+                    return self.centroids
 
         centroids = {}
 
@@ -145,20 +190,18 @@ class StyleAnalyzer:
                 print(f"Warning: No samples found for persona {persona_id}")
                 continue
 
-            # Extract features from each sample
-            feature_vectors = []
-            for sample in samples:
-                features = self.extract_stylometric_features(sample)
-                feature_vectors.append(features)
+            # Extract features from each sample into one preallocated matrix
+            feature_matrix = np.empty((len(samples), 10))
+            for i, sample in enumerate(samples):
+                feature_matrix[i] = self.extract_stylometric_features(sample)
 
             # Calculate centroid (mean of all samples)
-            centroid = np.mean(feature_vectors, axis=0)
+            centroid = feature_matrix.mean(axis=0)
             centroids[persona_id] = centroid
 
-        # Cache centroids
+        # Cache centroids (binary, so floats round-trip without text conversion)
         cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(cache_path, 'w') as f:
-            json.dump({k: v.tolist() for k, v in centroids.items()}, f, indent=2)
+        np.savez(cache_path, _feature_version=np.array(self.FEATURE_VERSION), **centroids)
 
         self.centroids = centroids
         return centroids
@@ -180,40 +223,73 @@ class StyleAnalyzer:
         Returns:
             Similarity score in [0, 1] or None if persona not available
         """
+        return self.calculate_style_similarity_batch([text], [persona_id])[0]
+
+    def calculate_style_similarity_batch(
+        self,
+        texts: List[str],
+        persona_ids: List[Optional[str]]
+    ) -> List[Optional[float]]:
+        """
+        Calculate stylometric similarity for many texts at once.
+
+        Features are stacked into an (N, 10) matrix and the Jensen-Shannon
+        distance to each text's persona centroid is computed in one set of
+        array operations. Equivalent to calling calculate_style_similarity
+        per text.
+
+        Args:
+            texts: Texts to analyze
+            persona_ids: Target persona ID for each text
+
+        Returns:
+            List of similarity scores in [0, 1] (None where the persona is
+            unavailable or style similarity is disabled)
+        """
+        # Skipped items need neither centroids nor feature extraction
         if not self.style_config.get('use_stylometric_similarity', True):
-            return None
+            return [None] * len(texts)
 
-        if persona_id is None:
-            return None
+        if all(persona_id is None for persona_id in persona_ids):
+            return [None] * len(texts)
 
         # Ensure centroids are built
         if not self.centroids:
             self.build_persona_centroids()
 
-        if persona_id not in self.centroids:
-            print(f"Warning: No centroid for persona {persona_id}")
-            return None
+        rows = []
+        for i, persona_id in enumerate(persona_ids):
+            if persona_id is None:
+                continue
+            if persona_id not in self.centroids:
+                print(f"Warning: No centroid for persona {persona_id}")
+                continue
+            rows.append(i)
+
+        similarities: List[Optional[float]] = [None] * len(texts)
+        if not rows:
+            return similarities
 
-        # Extract features from text
-        text_features = self.extract_stylometric_features(text)
-        persona_centroid = self.centroids[persona_id]
+        text_features = np.stack([self.extract_stylometric_features(texts[i]) for i in rows])
 
         # Normalize features to probability distributions (add small epsilon to avoid zeros)
         epsilon = 1e-10
         text_dist = text_features + epsilon
-        text_dist = text_dist / text_dist.sum()
+        text_dist /= text_dist.sum(axis=1, keepdims=True)
 
-        centroid_dist = persona_centroid + epsilon
-        centroid_dist = centroid_dist / centroid_dist.sum()
+        # Normalize the (K, 10) centroid stack once, then gather a row per text
+        persona_index = {persona_id: k for k, persona_id in enumerate(self.centroids)}
+        centroid_matrix = np.stack(list(self.centroids.values())) + epsilon
+        centroid_matrix /= centroid_matrix.sum(axis=1, keepdims=True)
+        centroid_dist = centroid_matrix[[persona_index[persona_ids[i]] for i in rows]]
 
-        # Calculate Jensen-Shannon divergence
-        js_divergence = jensenshannon(text_dist, centroid_dist)
+        # Row-wise Jensen-Shannon distance
+        js_distance = _js_distance(text_dist, centroid_dist)
 
-        # Convert to similarity (1 - divergence)
-        # JS divergence is in [0, 1] for probability distributions
-        similarity = 1.0 - js_divergence
+        for i, distance in zip(rows, js_distance):
+            similarities[i] = float(1.0 - distance)
 
-        return float(similarity)
+        return similarities
 
     def calculate_style_metrics(
         self,
@@ -2,14 +2,34 @@
 Text processing utilities.
 """
 
+import functools
 import re
 import string
-from typing import List
-import nltk
+from typing import List, Tuple
+
+# Translation table that deletes ASCII punctuation
+_PUNCT_DELETE = str.maketrans('', '', string.punctuation)
+
+# Regex tokenizers for the stylometric fast path
+_WORD_RE = re.compile(r"\b[\w']+\b")
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_VOWEL_RUN_RE = re.compile('[aeiouy]+')
+
+# Set once the NLTK data has been checked, so later calls skip the lookups.
+# NLTK itself is imported only by the functions that use it; the
+# stylometric fast path never loads it.
+_NLTK_READY = False
 
 
 def ensure_nltk_data():
     """Download required NLTK data if not present."""
+    global _NLTK_READY
+
+    if _NLTK_READY:
+        return
+
+    import nltk
+
     try:
         nltk.data.find('tokenizers/punkt')
     except LookupError:
@@ -20,6 +40,8 @@ def ensure_nltk_data():
     except LookupError:
         nltk.download('punkt_tab', quiet=True)
 
+    _NLTK_READY = True
+
 
 def tokenize_sentences(text: str) -> List[str]:
     """
@@ -31,6 +53,8 @@ def tokenize_sentences(text: str) -> List[str]:
     Returns:
         List of sentences
     """
+    import nltk
+
     ensure_nltk_data()
     return nltk.sent_tokenize(text)
 
@@ -45,14 +69,69 @@ def tokenize_words(text: str) -> List[str]:
     Returns:
         List of words
     """
+    import nltk
+
     ensure_nltk_data()
     return nltk.word_tokenize(text)
 
 
+def fast_tokenize_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences at ., ! or ? followed by whitespace.
+
+    Much cheaper than NLTK's Punkt tokenizer; used for stylometric features,
+    where only sentence counts matter.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of sentences
+    """
+    return [s for s in _SENT_SPLIT_RE.split(text.strip()) if s]
+
+
+def fast_tokenize_words(text: str) -> List[str]:
+    """
+    Tokenize text into words (letters, digits and apostrophes) with a regex.
+
+    Unlike tokenize_words, punctuation is not returned as tokens.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of words
+    """
+    return _WORD_RE.findall(text)
+
+
+def count_sentences_words(text: str) -> Tuple[int, List[str]]:
+    """
+    Count sentences and tokenize words in one call, for stylometric use.
+
+    Sentences are counted as separator matches (same splitting as
+    fast_tokenize_sentences) without building the sentence list.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Tuple of (number of sentences, list of words)
+    """
+    stripped = text.strip()
+    num_sentences = len(_SENT_SPLIT_RE.findall(stripped)) + 1 if stripped else 0
+    return num_sentences, _WORD_RE.findall(text)
+
+
+@functools.lru_cache(maxsize=100_000)
 def count_tokens(text: str) -> int:
     """
     Count number of tokens in text.
 
+    Results are memoized, so texts shared across examples (e.g. a source
+    document with several summaries) are tokenized once.
+
     Args:
         text: Input text
 
@@ -62,39 +141,45 @@ def count_tokens(text: str) -> int:
     return len(tokenize_words(text))
 
 
-def get_function_words() -> set:
+# Word sets for stylometric analysis, built once at import
+FUNCTION_WORDS = frozenset({
+    'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i',
+    'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at',
+    'this', 'but', 'his', 'by', 'from', 'they', 'we', 'say', 'her', 'she',
+    'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there', 'their',
+    'what', 'so', 'up', 'out', 'if', 'about', 'who', 'get', 'which', 'go',
+    'me', 'when', 'make', 'can', 'like', 'time', 'no', 'just', 'him', 'know',
+    'take', 'people', 'into', 'year', 'your', 'good', 'some', 'could', 'them',
+    'see', 'other', 'than', 'then', 'now', 'look', 'only', 'come', 'its', 'over'
+})
+
+PRONOUNS = frozenset({
+    'i', 'you', 'he', 'she', 'it', 'we', 'they',
+    'me', 'him', 'her', 'us', 'them',
+    'my', 'your', 'his', 'her', 'its', 'our', 'their',
+    'mine', 'yours', 'hers', 'ours', 'theirs',
+    'myself', 'yourself', 'himself', 'herself', 'itself', 'ourselves', 'themselves'
+})
+
+
+def get_function_words() -> frozenset:
     """
     Get set of common function words for stylometric analysis.
 
     Returns:
         Set of function words
     """
-    return {
-        'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i',
-        'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at',
-        'this', 'but', 'his', 'by', 'from', 'they', 'we', 'say', 'her', 'she',
-        'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there', 'their',
-        'what', 'so', 'up', 'out', 'if', 'about', 'who', 'get', 'which', 'go',
-        'me', 'when', 'make', 'can', 'like', 'time', 'no', 'just', 'him', 'know',
-        'take', 'people', 'into', 'year', 'your', 'good', 'some', 'could', 'them',
-        'see', 'other', 'than', 'then', 'now', 'look', 'only', 'come', 'its', 'over'
-    }
+    return FUNCTION_WORDS
 
 
-def get_pronouns() -> set:
+def get_pronouns() -> frozenset:
     """
     Get set of pronouns for stylometric analysis.
 
     Returns:
         Set of pronouns
     """
-    return {
-        'i', 'you', 'he', 'she', 'it', 'we', 'they',
-        'me', 'him', 'her', 'us', 'them',
-        'my', 'your', 'his', 'her', 'its', 'our', 'their',
-        'mine', 'yours', 'hers', 'ours', 'theirs',
-        'myself', 'yourself', 'himself', 'herself', 'itself', 'ourselves', 'themselves'
-    }
+    return PRONOUNS
 
 
 def calculate_flesch_kincaid_grade(text: str) -> float:
@@ -107,27 +192,36 @@ def calculate_flesch_kincaid_grade(text: str) -> float:
     Returns:
         Grade level score
     """
-    sentences = tokenize_sentences(text)
-    words = tokenize_words(text)
+    num_sentences, words = count_sentences_words(text)
+    return flesch_kincaid_grade_from_tokens(num_sentences, words)
 
-    if not sentences or not words:
-        return 0.0
 
-    # Count syllables (approximation)
-    syllable_count = sum(_count_syllables(word) for word in words)
+def flesch_kincaid_grade_from_tokens(num_sentences: int, words: List[str]) -> float:
+    """
+    Calculate Flesch-Kincaid grade level from an already tokenized text.
+
+    Args:
+        num_sentences: Number of sentences
+        words: Words of the text
 
-    num_sentences = len(sentences)
+    Returns:
+        Grade level score
+    """
     num_words = len(words)
 
     if num_sentences == 0 or num_words == 0:
         return 0.0
 
+    # Count syllables (approximation)
+    syllable_count = sum(_count_syllables(word) for word in words)
+
     # FK grade formula
     grade = 0.39 * (num_words / num_sentences) + 11.8 * (syllable_count / num_words) - 15.59
 
     return max(0.0, grade)
 
 
+@functools.lru_cache(maxsize=1 << 16)
 def _count_syllables(word: str) -> int:
     """
     Count syllables in a word (approximation).
@@ -139,15 +233,9 @@ def _count_syllables(word: str) -> int:
         Estimated syllable count
     """
     word = word.lower()
-    vowels = 'aeiouy'
-    syllable_count = 0
-    previous_was_vowel = False
 
-    for char in word:
-        is_vowel = char in vowels
-        if is_vowel and not previous_was_vowel:
-            syllable_count += 1
-        previous_was_vowel = is_vowel
+    # Each run of consecutive vowels counts as one syllable
+    syllable_count = len(_VOWEL_RUN_RE.findall(word))
 
     # Adjust for silent 'e'
     if word.endswith('e'):
@@ -174,5 +262,6 @@ def get_punctuation_counts(text: str) -> dict:
         'colon': text.count(':'),
         'exclamation': text.count('!'),
         'question': text.count('?'),
-        'total': sum(1 for c in text if c in string.punctuation)
+        # Deleting punctuation in C and diffing lengths avoids a per-char loop
+        'total': len(text) - len(text.translate(_PUNCT_DELETE))
     }
@@ -24,9 +24,13 @@ def test_local_model():
         print("  Run: python setup_roberta.py")
         return False
 
-    required_files = ["config.json", "merges.txt", "pytorch_model.bin", "vocab.json"]
+    required_files = ["config.json", "merges.txt", "vocab.json"]
     missing_files = [f for f in required_files if not (local_model_path / f).exists()]
 
+    weight_files = ["model.safetensors", "pytorch_model.bin"]
+    if not any((local_model_path / f).exists() for f in weight_files):
+        missing_files.append(" or ".join(weight_files))
+
     if missing_files:
         print(f"✗ Missing required files: {missing_files}")
         return False